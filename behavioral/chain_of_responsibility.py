@@ -16,32 +16,232 @@ Benefits of the Chain of Responsibility Pattern:
 
 Overall, the Chain of Responsibility pattern is a useful design pattern for building flexible and maintainable systems, especially when dealing with scenarios where multiple objects can handle requests, and the exact handler may vary at runtime.
 """
+import asyncio
+import inspect
+import time
 from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right
 
 
 class Handler(ABC):
+    # Requests this handler accepts by equality. Handlers with other acceptance rules override `accepts`.
+    keys = ()
+
     def __init__(self, successor=None):
         self.successor = successor
 
-    @abstractmethod
+    def accepts(self, request):
+        return request in self.keys
+
+    def process(self, request):
+        raise NotImplementedError(
+            f"{type(self).__name__} must implement process or handle_request"
+        )
+
     def handle_request(self, request):
-        pass
+        handler = self
+        while handler is not None:
+            # Handlers that override handle_request take over the rest of the walk themselves.
+            if handler is not self and _overrides_handle_request(handler):
+                return handler.handle_request(request)
+            if handler.accepts(request):
+                return handler.process(request)
+            handler = handler.successor
+
+
+def _overrides_handle_request(handler):
+    return type(handler).handle_request is not Handler.handle_request
 
 
 class ConcreteHandlerA(Handler):
-    def handle_request(self, request):
-        if request == "A":
-            print("Handled by ConcreteHandlerA.")
-        elif self.successor:
-            self.successor.handle_request(request)
+    keys = ("A",)
+
+    def process(self, request):
+        print("Handled by ConcreteHandlerA.")
 
 
 class ConcreteHandlerB(Handler):
+    keys = ("B",)
+
+    def process(self, request):
+        print("Handled by ConcreteHandlerB.")
+
+
+class ThresholdHandler(Handler):
+    def __init__(self, threshold, successor=None):
+        super().__init__(successor)
+        self.threshold = threshold
+
+    def accepts(self, request):
+        return isinstance(request, (int, float)) and request >= self.threshold
+
+    def process(self, request):
+        print(f"Handled by ThresholdHandler({self.threshold}).")
+
+
+class CompiledChain:
+    """
+    Snapshot of a handler chain compiled into a dispatch table. Handlers that only declare `keys` are looked up
+    with one dict access; handlers that override `accepts` are still checked in chain order, but only the ones
+    placed before the key match. The first handler that accepts a request wins, exactly as in the linear walk.
+    A handler that overrides `handle_request` ends the compiled part; requests nobody before it accepts are
+    passed to its `handle_request`. Compile the chain again after changing it.
+    """
+
+    def __init__(self, head):
+        self.handlers = []
+        self.tail = None
+        handler = head
+        while handler is not None:
+            if isinstance(handler, AsyncHandler):
+                raise TypeError("Chains with async handlers must be run by AsyncChain")
+            if _overrides_handle_request(handler):
+                self.tail = handler
+                break
+            self.handlers.append(handler)
+            handler = handler.successor
+
+        self.table = {}
+        self.predicate_positions = []
+        for position, handler in enumerate(self.handlers):
+            if type(handler).accepts is not Handler.accepts:
+                self.predicate_positions.append(position)
+                continue
+            for key in handler.keys:
+                self.table.setdefault(key, position)
+
+    def find_handler(self, request):
+        try:
+            position = self.table.get(request, len(self.handlers))
+        except TypeError:
+            # Unhashable requests can only be matched by predicate handlers.
+            position = len(self.handlers)
+
+        predicates_before = bisect_left(self.predicate_positions, position)
+        for predicate_position in self.predicate_positions[:predicates_before]:
+            handler = self.handlers[predicate_position]
+            if handler.accepts(request):
+                return handler
+        if position < len(self.handlers):
+            return self.handlers[position]
+        return None
+
+    def handle_request(self, request):
+        handler = self.find_handler(request)
+        if handler is not None:
+            return handler.process(request)
+        if self.tail is not None:
+            return self.tail.handle_request(request)
+
+
+class LatencyHistogram:
+    BOUNDS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+        self.total = 0
+
+    def record(self, seconds):
+        self.counts[bisect_right(self.BOUNDS, seconds)] += 1
+        self.total += 1
+
+    def buckets(self):
+        """Returns (upper bound in seconds, count) pairs; the last bound is infinity."""
+        return list(zip(self.BOUNDS + (float("inf"),), self.counts))
+
+
+async def _maybe_await(value):
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+
+class AsyncChain:
+    """
+    Runs a handler chain whose `accepts` and `process` may be coroutines. Each acceptance check is bounded by
+    the handler's `timeout` attribute (or the chain default); a check that times out counts as "not accepted".
+    `handle_request` asks handlers in chain order, while `fan_out` asks all of them at once and lets the first
+    handler to accept process the request. The latency of every check is recorded per handler.
+    """
+
+    def __init__(self, head, timeout=None):
+        self.handlers = []
+        handler = head
+        while handler is not None:
+            self.handlers.append(handler)
+            handler = handler.successor
+        self.timeout = timeout
+        self.histograms = {handler: LatencyHistogram() for handler in self.handlers}
+
+    async def _accepts(self, handler, request):
+        started = time.perf_counter()
+        try:
+            accepted = await asyncio.wait_for(
+                _maybe_await(handler.accepts(request)),
+                getattr(handler, "timeout", None) or self.timeout,
+            )
+        except asyncio.TimeoutError:
+            accepted = False
+        # Checks cancelled by fan_out never get here, so they are not recorded.
+        self.histograms[handler].record(time.perf_counter() - started)
+        return accepted
+
+    async def handle_request(self, request):
+        for handler in self.handlers:
+            if await self._accepts(handler, request):
+                return await _maybe_await(handler.process(request))
+
+    async def _check(self, handler, request):
+        return handler, await self._accepts(handler, request)
+
+    async def fan_out(self, request):
+        checks = [
+            asyncio.ensure_future(self._check(handler, request))
+            for handler in self.handlers
+        ]
+        try:
+            for check in asyncio.as_completed(checks):
+                handler, accepted = await check
+                if accepted:
+                    break
+            else:
+                return None
+        finally:
+            for pending in checks:
+                pending.cancel()
+        return await _maybe_await(handler.process(request))
+
+
+class AsyncHandler(Handler):
+    """Handler whose `accepts` and `process` are coroutines; such chains can only be run by AsyncChain."""
+
+    async def accepts(self, request):
+        return request in self.keys
+
+    @abstractmethod
+    async def process(self, request):
+        pass
+
     def handle_request(self, request):
-        if request == "B":
-            print("Handled by ConcreteHandlerB.")
-        elif self.successor:
-            self.successor.handle_request(request)
+        raise TypeError(
+            f"{type(self).__name__} is async; run the chain with AsyncChain"
+        )
+
+
+class EntitlementHandler(AsyncHandler):
+    def __init__(self, name, entitled, delay, successor=None, timeout=None):
+        super().__init__(successor)
+        self.name = name
+        self.entitled = entitled
+        self.delay = delay
+        self.timeout = timeout
+
+    async def accepts(self, request):
+        await asyncio.sleep(self.delay)  # Stands in for an entitlement lookup.
+        return request in self.entitled
+
+    async def process(self, request):
+        return f"{request} handled by {self.name}"
 
 
 if __name__ == "__main__":
@@ -54,3 +254,20 @@ if __name__ == "__main__":
 
     for request in requests:
         handler_a.handle_request(request)
+
+    handler_b.successor = ThresholdHandler(100)
+    compiled_chain = CompiledChain(handler_a)
+    for request in ["A", "B", 250, "C"]:
+        compiled_chain.handle_request(request)
+
+    async def run_async_chain():
+        slow = EntitlementHandler("slow", {"trade"}, delay=0.2, timeout=0.05)
+        fast = EntitlementHandler("fast", {"trade", "report"}, delay=0.01)
+        slow.successor = fast
+        async_chain = AsyncChain(slow)
+        print(await async_chain.handle_request("trade"))
+        print(await async_chain.fan_out("report"))
+        for handler, histogram in async_chain.histograms.items():
+            print(handler.name, [bucket for bucket in histogram.buckets() if bucket[1]])
+
+    asyncio.run(run_async_chain())
@@ -23,7 +23,18 @@ You can introduce new command classes to add functionality or modify existing on
 These benefits make the Command pattern a powerful tool for managing and abstracting actions, requests, or operations in various applications, including user interfaces, automation systems, and financial software. 
 It enhances code modularity, supports undo/redo functionality, and provides a clean separation of concerns.
 """
+
+import os
+import struct
+import tempfile
+import threading
+import time
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+# Serialized command: opcode, symbol length, quantity, followed by the UTF-8 symbol.
+COMMAND_HEADER = struct.Struct("<BBq")
 
 
 class Command(ABC):
@@ -32,22 +43,293 @@ class Command(ABC):
         pass
 
 
-class BuyStockCommand(Command):
+class StockCommand(Command):
+    """
+    A command that trades `quantity` shares of one stock. Stock commands can be undone, batched by replaying
+    them against a running position, and serialized to a command log.
+    """
+
+    OPCODE = None
+
     def __init__(self, stock, quantity):
         self.stock = stock
         self.quantity = quantity
+        self.executed = False
+
+    @abstractmethod
+    def undo(self):
+        pass
+
+    @abstractmethod
+    def apply_to_position(self, position):
+        """Returns the position after this command, or None when the command would fail."""
+
+    @abstractmethod
+    def revert_position(self, position):
+        """Returns the position after undoing this command, or None when the undo would fail."""
+
+    def to_bytes(self):
+        symbol = self.stock.symbol.encode("utf-8")
+        return COMMAND_HEADER.pack(self.OPCODE, len(symbol), self.quantity) + symbol
+
+    @staticmethod
+    def from_bytes(data, stocks, offset=0):
+        """
+        Decodes the command at `offset`, resolving its stock in the `stocks` mapping (symbol -> Stock) and
+        adding missing stocks to it. Returns the command and the offset of the next one, or None when the
+        data ends in the middle of a command.
+        """
+        if len(data) - offset < COMMAND_HEADER.size:
+            return None
+        opcode, symbol_length, quantity = COMMAND_HEADER.unpack_from(data, offset)
+        offset += COMMAND_HEADER.size
+        if len(data) - offset < symbol_length:
+            return None
+        symbol = bytes(data[offset : offset + symbol_length]).decode("utf-8")
+        stock = stocks.get(symbol)
+        if stock is None:
+            stock = stocks[symbol] = Stock(symbol)
+        return COMMAND_TYPES[opcode](stock, quantity), offset + symbol_length
+
+
+class BuyStockCommand(StockCommand):
+    OPCODE = 1
 
     def execute(self):
         self.stock.buy(self.quantity)
+        self.executed = True
+        return True
 
+    def undo(self):
+        if not self.executed or not self.stock.sell(self.quantity):
+            return False
+        self.executed = False
+        return True
 
-class SellStockCommand(Command):
-    def __init__(self, stock, quantity):
-        self.stock = stock
-        self.quantity = quantity
+    def apply_to_position(self, position):
+        return position + self.quantity
+
+    def revert_position(self, position):
+        if position >= self.quantity:
+            return position - self.quantity
+        return None
+
+
+class SellStockCommand(StockCommand):
+    OPCODE = 2
+
+    def execute(self):
+        self.executed = self.stock.sell(self.quantity)
+        return self.executed
+
+    def undo(self):
+        if not self.executed:
+            return False
+        self.stock.buy(self.quantity)
+        self.executed = False
+        return True
+
+    def apply_to_position(self, position):
+        if position >= self.quantity:
+            return position - self.quantity
+        return None
+
+    def revert_position(self, position):
+        return position + self.quantity
+
+
+COMMAND_TYPES = {
+    command_type.OPCODE: command_type
+    for command_type in (BuyStockCommand, SellStockCommand)
+}
+
+
+class CommandBatch:
+    """
+    Collects buy and sell commands and executes them per stock in one step. Commands are replayed against
+    a running position for each stock, so each sell is validated exactly as if the commands had run one by one,
+    and only the resulting position is written back to the stock.
+    """
+
+    def __init__(self, commands=()):
+        self.commands = []
+        self.extend(commands)
+
+    def add(self, command):
+        if not isinstance(command, StockCommand):
+            raise TypeError(f"{type(command).__name__} cannot be batched")
+        self.commands.append(command)
+
+    def extend(self, commands):
+        for command in commands:
+            self.add(command)
 
     def execute(self):
-        self.stock.sell(self.quantity)
+        """Returns whether each command succeeded, in the order the commands were added."""
+        positions = {}
+        outcomes = []
+        for command in self.commands:
+            stock = command.stock
+            position = positions.get(stock)
+            if position is None:
+                position = stock.quantity
+            new_position = command.apply_to_position(position)
+            if new_position is None:
+                outcomes.append(False)
+            else:
+                positions[stock] = new_position
+                command.executed = True
+                outcomes.append(True)
+
+        for stock, position in positions.items():
+            stock.quantity = position
+        self.commands = []
+        return outcomes
+
+
+class CommandJournal:
+    """
+    Executes commands and records them in an append-only command log. A command is logged after it runs, and
+    records are buffered and written with a single fsync per `group_size` commands (group commit), so commands
+    executed since the last `commit()` are lost on a crash. Every `checkpoint_interval` records the stock
+    positions are checkpointed and a new log generation is started, so recovery loads the checkpoint and replays
+    only the log written after it. Every stock a command targets is tracked in `stocks` by symbol.
+    """
+
+    EXECUTE = 0
+    UNDO = 1
+    CHECKPOINT_HEADER = struct.Struct("<QI")
+    POSITION = struct.Struct("<Bq")
+
+    def __init__(self, path, stocks=None, group_size=64, checkpoint_interval=10000):
+        self.path = path
+        self.checkpoint_path = path + ".checkpoint"
+        self.stocks = {} if stocks is None else stocks
+        self.group_size = group_size
+        self.checkpoint_interval = checkpoint_interval
+        self.history = []
+        self._pending = []
+        self._generation = 0
+        self._since_checkpoint = 0
+        self.recover()
+        self._log = open(self._log_path(), "ab")
+
+    def _log_path(self, generation=None):
+        return f"{self.path}.{self._generation if generation is None else generation}"
+
+    def execute(self, command):
+        self._register(command.stock)
+        succeeded = command.execute()
+        if succeeded:
+            # Failed commands cannot be undone, so they would only block the undo stack.
+            self.history.append(command)
+        self._record(self.EXECUTE, command)
+        return succeeded
+
+    def _register(self, stock):
+        registered = self.stocks.setdefault(stock.symbol, stock)
+        if registered is not stock:
+            raise ValueError(
+                f"Another Stock object is already journaled for {stock.symbol}"
+            )
+
+    def undo(self):
+        if not self.history:
+            return False
+        command = self.history[-1]
+        if not command.undo():
+            return False
+        self.history.pop()
+        self._record(self.UNDO, command)
+        return True
+
+    def _record(self, kind, command):
+        self._pending.append(bytes((kind,)) + command.to_bytes())
+        self._since_checkpoint += 1
+        if len(self._pending) >= self.group_size:
+            self.commit()
+        if self._since_checkpoint >= self.checkpoint_interval:
+            self.checkpoint()
+
+    def commit(self):
+        if self._pending:
+            self._log.write(b"".join(self._pending))
+            self._log.flush()
+            os.fsync(self._log.fileno())
+            self._pending = []
+
+    def checkpoint(self):
+        self.commit()
+        generation = self._generation + 1
+        with open(self.checkpoint_path + ".tmp", "wb") as checkpoint_file:
+            checkpoint_file.write(
+                self.CHECKPOINT_HEADER.pack(generation, len(self.stocks))
+            )
+            for symbol, stock in self.stocks.items():
+                encoded = symbol.encode("utf-8")
+                checkpoint_file.write(
+                    self.POSITION.pack(len(encoded), stock.quantity) + encoded
+                )
+            checkpoint_file.flush()
+            os.fsync(checkpoint_file.fileno())
+        # The checkpoint becomes visible atomically; the old log generation is ignored from here on.
+        os.replace(self.checkpoint_path + ".tmp", self.checkpoint_path)
+
+        self._log.close()
+        old_log_path = self._log_path()
+        self._generation = generation
+        self._log = open(self._log_path(), "ab")
+        os.remove(old_log_path)
+        self._since_checkpoint = 0
+
+    def recover(self):
+        """Restores stock positions from the latest checkpoint plus the log written after it."""
+        if os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, "rb") as checkpoint_file:
+                data = checkpoint_file.read()
+            self._generation, count = self.CHECKPOINT_HEADER.unpack_from(data)
+            offset = self.CHECKPOINT_HEADER.size
+            for _ in range(count):
+                symbol_length, quantity = self.POSITION.unpack_from(data, offset)
+                offset += self.POSITION.size
+                symbol = data[offset : offset + symbol_length].decode("utf-8")
+                offset += symbol_length
+                if symbol not in self.stocks:
+                    self.stocks[symbol] = Stock(symbol)
+                self.stocks[symbol].quantity = quantity
+
+        if not os.path.exists(self._log_path()):
+            return
+        with open(self._log_path(), "rb") as log_file:
+            data = log_file.read()
+
+        positions = {}
+        offset = 0
+        while offset < len(data):
+            decoded = StockCommand.from_bytes(data, self.stocks, offset + 1)
+            if decoded is None:
+                break  # Torn write at the end of the log.
+            command, next_offset = decoded
+            stock = command.stock
+            position = positions.get(stock, stock.quantity)
+            if data[offset] == self.UNDO:
+                new_position = command.revert_position(position)
+            else:
+                new_position = command.apply_to_position(position)
+            if new_position is not None:
+                positions[stock] = new_position
+            offset = next_offset
+            self._since_checkpoint += 1
+
+        for stock, position in positions.items():
+            stock.quantity = position
+        if offset < len(data):
+            with open(self._log_path(), "r+b") as log_file:
+                log_file.truncate(offset)
+
+    def close(self):
+        self.commit()
+        self._log.close()
 
 
 class Stock:
@@ -63,8 +345,84 @@ class Stock:
         if self.quantity >= quantity:
             self.quantity -= quantity
             print(f"Sold {quantity} shares of {self.symbol}")
-        else:
-            print("Not enough shares to sell.")
+            return True
+        print("Not enough shares to sell.")
+        return False
+
+
+class LockedStock(Stock):
+    def __init__(self, symbol):
+        super().__init__(symbol)
+        self._lock = threading.Lock()
+
+    def buy(self, quantity):
+        with self._lock:
+            super().buy(quantity)
+
+    def sell(self, quantity):
+        with self._lock:
+            return super().sell(quantity)
+
+
+@dataclass
+class ExecutionReport:
+    outcomes: list
+    elapsed: float
+    throughput: float
+    latency_p50: float
+    latency_p99: float
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[
+        min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    ]
+
+
+class ShardedCommandExecutor:
+    """
+    Runs commands concurrently on a thread pool, partitioned by target stock. Commands for the same stock run
+    in submission order on one worker, while different stocks proceed independently. Use `LockedStock` when
+    the same stocks may also be traded outside the executor.
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers
+
+    def execute(self, commands):
+        partitions = {}
+        for index, command in enumerate(commands):
+            partitions.setdefault(command.stock, []).append((index, command))
+
+        outcomes = [None] * len(commands)
+        latencies = []
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for results in executor.map(self._run_partition, partitions.values()):
+                for index, outcome, latency in results:
+                    outcomes[index] = outcome
+                    latencies.append(latency)
+        elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        return ExecutionReport(
+            outcomes=outcomes,
+            elapsed=elapsed,
+            throughput=len(commands) / elapsed if elapsed else 0.0,
+            latency_p50=_percentile(latencies, 0.50),
+            latency_p99=_percentile(latencies, 0.99),
+        )
+
+    @staticmethod
+    def _run_partition(partition):
+        results = []
+        for index, command in partition:
+            command_started = time.perf_counter()
+            outcome = command.execute()
+            results.append((index, outcome, time.perf_counter() - command_started))
+        return results
 
 
 if __name__ == "__main__":
@@ -76,3 +434,45 @@ if __name__ == "__main__":
 
     buy_apple.execute()
     sell_google.execute()
+
+    batch = CommandBatch(
+        [
+            BuyStockCommand(google_stock, 80),
+            SellStockCommand(google_stock, 50),
+            SellStockCommand(google_stock, 50),
+            SellStockCommand(apple_stock, 30),
+        ]
+    )
+    print(batch.execute())  # [True, True, False, True]
+    print(
+        f"{apple_stock.symbol}: {apple_stock.quantity}, {google_stock.symbol}: {google_stock.quantity}"
+    )
+
+    with tempfile.TemporaryDirectory() as journal_dir:
+        journal_path = os.path.join(journal_dir, "trades")
+        journal = CommandJournal(
+            journal_path, {"AAPL": Stock("AAPL")}, group_size=2, checkpoint_interval=3
+        )
+        journal.execute(BuyStockCommand(journal.stocks["AAPL"], 100))
+        journal.execute(SellStockCommand(journal.stocks["AAPL"], 40))
+        journal.execute(BuyStockCommand(journal.stocks["AAPL"], 10))
+        journal.undo()
+        journal.close()
+
+        recovered = CommandJournal(journal_path)
+        print(f"Recovered AAPL position: {recovered.stocks['AAPL'].quantity}")  # 60
+        recovered.close()
+
+    locked_stocks = [LockedStock(symbol) for symbol in ("AAPL", "GOOGL", "MSFT")]
+    orders = []
+    for stock in locked_stocks:
+        orders += [
+            BuyStockCommand(stock, 10),
+            SellStockCommand(stock, 5),
+            SellStockCommand(stock, 10),
+        ]
+    report = ShardedCommandExecutor(max_workers=3).execute(orders)
+    print(report.outcomes)
+    print(
+        f"{report.throughput:.0f} commands/s, p50 {report.latency_p50 * 1e6:.1f}us, p99 {report.latency_p99 * 1e6:.1f}us"
+    )
@@ -20,8 +20,17 @@ This reusability promotes code efficiency and reduces redundancy.
 These benefits make the Iterator pattern a valuable tool for simplifying the traversal of collections, enhancing code modularity, and promoting the separation of concerns 
 in software design. It is commonly used in various programming scenarios, including data access layers, user interface components, and data processing applications.
 """
+import itertools
+import mmap
+import os
+import tempfile
+import threading
+from array import array
+from collections import deque
 from collections.abc import Iterator
 
+_EXHAUSTED = object()
+
 
 class FinancialIterator(Iterator):
     def __init__(self, financial_data):
@@ -37,15 +46,284 @@ class FinancialIterator(Iterator):
             raise StopIteration("No more data!")
 
 
+class BatchedFinancialIterator(Iterator):
+    """Iterates over the transactions of a sequence of batches, as produced by `iter_batches`."""
+
+    def __init__(self, batches):
+        self._batches = iter(batches)
+        self._batch = iter(())
+
+    def __next__(self):
+        transaction = next(self._batch, _EXHAUSTED)
+        while transaction is _EXHAUSTED:
+            self._batch = iter(next(self._batches))
+            transaction = next(self._batch, _EXHAUSTED)
+        return transaction
+
+
+class TransactionList(list):
+    def iter_batches(self, size, start=0):
+        for first in range(start, len(self), size):
+            yield self[first : first + size]
+
+
+class TransactionBatch:
+    """
+    A run of consecutive transactions from a FileTransactionStore. `data` is a memoryview over the encoded
+    transactions and `ends` holds the end offset of each one inside `data`; neither is a copy.
+    Iterating decodes the transactions one by one.
+    """
+
+    def __init__(self, data, ends, base):
+        self.data = data
+        self.ends = ends
+        self._base = base
+
+    def __len__(self):
+        return len(self.ends)
+
+    def __iter__(self):
+        data = self.data
+        start = 0
+        for end in self.ends:
+            end -= self._base
+            yield str(data[start:end], "utf-8")
+            start = end
+
+
+class FileTransactionStore:
+    """
+    Append-only transaction storage on disk. Transactions are stored as UTF-8 records in a data file, with
+    the end offset of each record in an index file. Both files are read through `mmap`, so batches are views
+    into the page cache and the history does not have to fit in memory.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.index_path = path + ".idx"
+        self._data = open(path, "a+b")
+        self._index = open(self.index_path, "a+b")
+        self._end = self._data.seek(0, os.SEEK_END)
+        self._count = self._index.seek(0, os.SEEK_END) // 8
+        self._views = None
+
+    def append(self, transaction):
+        encoded = transaction.encode("utf-8")
+        self._data.write(encoded)
+        self._end += len(encoded)
+        array("Q", (self._end,)).tofile(self._index)
+        self._count += 1
+
+    def __len__(self):
+        return self._count
+
+    def _map(self, count):
+        # Mappings are reused until more transactions have been appended.
+        if self._views is None or self._views[0] != count:
+            self._data.flush()
+            self._index.flush()
+            # mmap cannot map an empty file, which is what a store of empty transactions has.
+            data = (
+                mmap.mmap(self._data.fileno(), 0, access=mmap.ACCESS_READ)
+                if self._end
+                else b""
+            )
+            ends = mmap.mmap(self._index.fileno(), 0, access=mmap.ACCESS_READ)
+            self._views = (
+                count,
+                memoryview(data),
+                memoryview(ends)[: count * 8].cast("Q"),
+            )
+        return self._views[1], self._views[2]
+
+    def __getitem__(self, index):
+        if not 0 <= index < self._count:
+            raise IndexError("Transaction index out of range")
+        data, ends = self._map(self._count)
+        start = ends[index - 1] if index else 0
+        return str(data[start : ends[index]], "utf-8")
+
+    def iter_batches(self, size, start=0):
+        count = self._count
+        if not 0 <= start < count:
+            if start == count:
+                return
+            raise IndexError("Transaction index out of range")
+        data, ends = self._map(count)
+        for first in range(start, count, size):
+            last = min(first + size, count)
+            base = ends[first - 1] if first else 0
+            yield TransactionBatch(data[base : ends[last - 1]], ends[first:last], base)
+
+    def close(self):
+        self._data.close()
+        self._index.close()
+
+
+class SegmentedTransactionLog:
+    """
+    Append-only transaction log made of fixed-size segments, for reading while another thread appends.
+    A transaction is written into its segment before the published length is advanced, and segments are never
+    moved or resized, so readers need no lock: each iterator reads up to the length published when it was
+    created and sees a consistent snapshot. Appends are serialized by a writer-only lock.
+    """
+
+    def __init__(self, segment_size=4096):
+        self.segment_size = segment_size
+        self._segments = []
+        self._length = 0
+        self._write_lock = threading.Lock()
+
+    def append(self, transaction):
+        with self._write_lock:
+            segment_index, slot = divmod(self._length, self.segment_size)
+            if segment_index == len(self._segments):
+                self._segments.append([None] * self.segment_size)
+            self._segments[segment_index][slot] = transaction
+            self._length += 1
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if not 0 <= index < self._length:
+            raise IndexError("Transaction index out of range")
+        segment_index, slot = divmod(index, self.segment_size)
+        return self._segments[segment_index][slot]
+
+    def iter_batches(self, size, start=0, stop=None):
+        """Yields batches from `start` up to the length published now; batches never span segments."""
+        length = self._length if stop is None else min(stop, self._length)
+        return self._read(size, start, length)
+
+    def _read(self, size, position, length):
+        while position < length:
+            segment_index, slot = divmod(position, self.segment_size)
+            end = min(slot + size, self.segment_size, slot + length - position)
+            yield self._segments[segment_index][slot:end]
+            position += end - slot
+
+
+class ReaderCursor:
+    """Durable read offset for one consumer, stored in a small file that is replaced atomically on commit."""
+
+    def __init__(self, path):
+        self.path = path
+        self.offset = 0
+        if os.path.exists(path):
+            with open(path) as cursor_file:
+                self.offset = int(cursor_file.read() or 0)
+
+    def commit(self, offset):
+        with open(self.path + ".tmp", "w") as cursor_file:
+            cursor_file.write(str(offset))
+            cursor_file.flush()
+            os.fsync(cursor_file.fileno())
+        os.replace(self.path + ".tmp", self.path)
+        self.offset = offset
+
+
+class TransactionQuery:
+    """
+    Lazy, chainable pipeline over the transactions of a FinancialData. Nothing is read until the query is
+    iterated, and every stage is a generator, so no intermediate lists are built. A `where` at the start of
+    the query is answered from a storage index when FinancialData has one for the same key function.
+    Queries are immutable: every stage method returns a new query, so a query can be extended in several ways.
+    """
+
+    def __init__(self, financial_data, lookup=None, stages=()):
+        self._data = financial_data
+        self._lookup = lookup
+        self._stages = stages
+
+    def _then(self, stage):
+        return TransactionQuery(self._data, self._lookup, self._stages + (stage,))
+
+    def where(self, key, value):
+        if not self._stages and self._lookup is None and key in self._data.indexes:
+            return TransactionQuery(self._data, (key, value))
+        return self.filter(lambda transaction: key(transaction) == value)
+
+    def filter(self, predicate):
+        return self._then(lambda transactions: filter(predicate, transactions))
+
+    def map(self, function):
+        return self._then(lambda transactions: map(function, transactions))
+
+    def window(self, size):
+        """Groups consecutive transactions into tuples of `size`; the last tuple may be shorter."""
+
+        def stage(transactions):
+            transactions = iter(transactions)
+            while True:
+                window = tuple(itertools.islice(transactions, size))
+                if not window:
+                    return
+                yield window
+
+        return self._then(stage)
+
+    def group_by_key(self, key):
+        """Yields (key, tuple of transactions) for each run of consecutive transactions sharing a key."""
+
+        def stage(transactions):
+            for group_key, group in itertools.groupby(transactions, key):
+                yield group_key, tuple(group)
+
+        return self._then(stage)
+
+    def rolling(self, size, aggregate=sum):
+        """Yields `aggregate` over each sliding window of `size` consecutive values."""
+
+        def stage(values):
+            window = deque(maxlen=size)
+            for value in values:
+                window.append(value)
+                if len(window) == size:
+                    yield aggregate(window)
+
+        return self._then(stage)
+
+    def __iter__(self):
+        if self._lookup is not None:
+            transactions = self._data.iter_indexed(*self._lookup)
+        else:
+            transactions = self._data.create_iterator()
+        for stage in self._stages:
+            transactions = stage(transactions)
+        return iter(transactions)
+
+
 class FinancialData:
-    def __init__(self):
-        self.transactions = []
+    def __init__(self, store=None):
+        self.transactions = TransactionList() if store is None else store
+        self.indexes = {}
 
     def add_transaction(self, transaction):
+        position = len(self.transactions)
         self.transactions.append(transaction)
+        for key, index in self.indexes.items():
+            index.setdefault(key(transaction), array("Q")).append(position)
+
+    def add_index(self, key):
+        """Indexes transactions by `key(transaction)` so queries filtering on that key can skip the scan."""
+        index = {}
+        for position, transaction in enumerate(self.create_iterator()):
+            index.setdefault(key(transaction), array("Q")).append(position)
+        self.indexes[key] = index
+
+    def iter_indexed(self, key, value):
+        for position in self.indexes[key].get(value, ()):
+            yield self.transactions[position]
+
+    def query(self):
+        return TransactionQuery(self)
+
+    def iter_batches(self, size=1024, start=0):
+        return self.transactions.iter_batches(size, start)
 
     def create_iterator(self):
-        return FinancialIterator(self.transactions)
+        return BatchedFinancialIterator(self.iter_batches())
 
 
 if __name__ == "__main__":
@@ -59,3 +337,42 @@ if __name__ == "__main__":
     print("Financial Transactions:")
     for transaction in iterator:
         print(transaction)
+
+    def transaction_kind(transaction):
+        return transaction.split()[0]
+
+    def amount(transaction):
+        return int(transaction.rsplit("$", 1)[1])
+
+    financial_data.add_index(transaction_kind)
+    for number in range(1, 6):
+        financial_data.add_transaction(f"Deposit ${number * 100}")
+
+    deposits = financial_data.query().where(transaction_kind, "Deposit").map(amount)
+    print(f"Rolling deposit totals: {list(deposits.rolling(3))}")
+
+    with tempfile.TemporaryDirectory() as store_dir:
+        store = FileTransactionStore(os.path.join(store_dir, "transactions"))
+        file_backed_data = FinancialData(store)
+        for number in range(10):
+            file_backed_data.add_transaction(f"Deposit ${number * 100}")
+
+        for batch in file_backed_data.iter_batches(4):
+            print(f"Batch of {len(batch)} transactions, {batch.data.nbytes} bytes")
+        print(list(file_backed_data.create_iterator())[-1])
+        store.close()
+
+        live_data = FinancialData(SegmentedTransactionLog(segment_size=1024))
+        cursor = ReaderCursor(os.path.join(store_dir, "report.cursor"))
+
+        def ingest():
+            for number in range(50_000):
+                live_data.add_transaction(f"Deposit ${number}")
+
+        writer = threading.Thread(target=ingest)
+        writer.start()
+        while writer.is_alive() or cursor.offset < len(live_data.transactions):
+            for batch in live_data.iter_batches(4096, start=cursor.offset):
+                cursor.commit(cursor.offset + len(batch))
+        writer.join()
+        print(f"Reader caught up at offset {cursor.offset}")
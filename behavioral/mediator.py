@@ -17,7 +17,95 @@ The Mediator pattern offers several benefits in software design and architecture
 These benefits make the Mediator pattern a valuable choice when dealing with complex systems, especially in scenarios where many objects need to communicate or coordinate their actions. It enhances code maintainability, scalability, and flexibility while promoting a clean separation of concerns.
 
 """
+import asyncio
+import heapq
+import itertools
+import math
+import random
+import struct
+import tempfile
+import time
 from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from dataclasses import dataclass, field
+
+BUY = "Buy"
+SELL = "Sell"
+
+
+@dataclass
+class Order:
+    side: str
+    symbol: str
+    quantity: int
+    price: float = None
+    trader: object = None
+    order_id: int = None
+    timestamp: float = field(default_factory=time.time)
+
+    def __post_init__(self):
+        self.remaining = self.quantity
+
+    def __str__(self):
+        description = f"{self.side} {self.quantity} shares of {self.symbol}"
+        if self.price is not None:
+            description += f" at {self.price}"
+        return description
+
+
+@dataclass
+class Fill:
+    symbol: str
+    quantity: int
+    price: float
+    buy_order: Order
+    sell_order: Order
+
+
+class OrderBook:
+    """
+    Limit order book for one symbol. Bids and asks are heaps keyed on price and arrival sequence, so incoming
+    orders match with price-time priority. Orders without a price are market orders and never rest on the book.
+    """
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+        self.bids = []
+        self.asks = []
+        self._sequence = itertools.count()
+
+    def match(self, order):
+        if order.side == BUY:
+            resting, opposite, sign = self.bids, self.asks, 1
+        else:
+            resting, opposite, sign = self.asks, self.bids, -1
+
+        fills = []
+        while order.remaining and opposite:
+            best = opposite[0][2]
+            if order.price is not None and sign * (best.price - order.price) > 0:
+                break
+            quantity = min(order.remaining, best.remaining)
+            order.remaining -= quantity
+            best.remaining -= quantity
+            if order.side == BUY:
+                fills.append(Fill(self.symbol, quantity, best.price, order, best))
+            else:
+                fills.append(Fill(self.symbol, quantity, best.price, best, order))
+            if not best.remaining:
+                heapq.heappop(opposite)
+
+        if order.remaining and order.price is not None:
+            heapq.heappush(resting, (-sign * order.price, next(self._sequence), order))
+        return fills
+
+    def best_bid(self):
+        return self.bids[0][2].price if self.bids else None
+
+    def best_ask(self):
+        return self.asks[0][2].price if self.asks else None
 
 
 class StockExchangeMediator(ABC):
@@ -35,18 +123,333 @@ class StockExchange(StockExchangeMediator):
         self.orders.append(order)
 
 
+OrderRecord = namedtuple(
+    "OrderRecord",
+    ["trader", "side", "symbol", "quantity", "price", "timestamp", "arrival"],
+)
+
+
+class OrderLog:
+    """
+    Append-only order log stored as fixed-width columns instead of one string per order. Trader names and
+    symbols are interned to integer ids, per-symbol and per-trader row indexes make filtered queries
+    proportional to the matching rows. Orders keep their own timestamp; time ranges are found by bisecting
+    a separate arrival-time column, which the log keeps non-decreasing. Market orders are stored with a NaN price.
+    """
+
+    FILE_HEADER = struct.Struct("<4sQII")
+    STRING_LENGTH = struct.Struct("<I")
+    MAGIC = b"OLOG"
+
+    def __init__(self):
+        self.trader_names = []
+        self.symbols = []
+        self._trader_ids = {}
+        self._symbol_ids = {}
+        self.trader_column = array("I")
+        self.side_column = array("b")
+        self.symbol_column = array("I")
+        self.quantity_column = array("q")
+        self.price_column = array("d")
+        self.timestamp_column = array("d")
+        self.arrival_column = array("d")
+        self._rows_by_symbol = {}
+        self._rows_by_trader = {}
+
+    def __len__(self):
+        return len(self.timestamp_column)
+
+    @staticmethod
+    def _intern(value, ids, values):
+        value_id = ids.get(value)
+        if value_id is None:
+            value_id = ids[value] = len(values)
+            values.append(value)
+        return value_id
+
+    def append(self, trader_name, side, symbol, quantity, price=None, timestamp=None):
+        arrival = time.time()
+        if timestamp is None:
+            timestamp = arrival
+        if self.arrival_column:
+            # Keep the arrival column sorted so time range queries can bisect it.
+            arrival = max(arrival, self.arrival_column[-1])
+        row = len(self)
+        trader_id = self._intern(trader_name, self._trader_ids, self.trader_names)
+        symbol_id = self._intern(symbol, self._symbol_ids, self.symbols)
+        self.trader_column.append(trader_id)
+        self.side_column.append(1 if side == BUY else -1)
+        self.symbol_column.append(symbol_id)
+        self.quantity_column.append(quantity)
+        self.price_column.append(math.nan if price is None else price)
+        self.timestamp_column.append(timestamp)
+        self.arrival_column.append(arrival)
+        self._rows_by_symbol.setdefault(symbol_id, array("Q")).append(row)
+        self._rows_by_trader.setdefault(trader_id, array("Q")).append(row)
+
+    def append_order(self, trader, order):
+        self.append(
+            trader.name if trader is not None else "",
+            order.side,
+            order.symbol,
+            order.quantity,
+            order.price,
+            order.timestamp,
+        )
+
+    def record(self, row):
+        price = self.price_column[row]
+        return OrderRecord(
+            self.trader_names[self.trader_column[row]],
+            BUY if self.side_column[row] > 0 else SELL,
+            self.symbols[self.symbol_column[row]],
+            self.quantity_column[row],
+            None if math.isnan(price) else price,
+            self.timestamp_column[row],
+            self.arrival_column[row],
+        )
+
+    def query(self, symbol=None, trader=None, start=None, end=None):
+        """Returns the matching row numbers in log order. `start` and `end` bound the arrival time inclusively."""
+        low = 0 if start is None else bisect_left(self.arrival_column, start)
+        high = len(self) if end is None else bisect_right(self.arrival_column, end)
+
+        candidates = []
+        if symbol is not None:
+            candidates.append(
+                self._rows_by_symbol.get(self._symbol_ids.get(symbol), array("Q"))
+            )
+        if trader is not None:
+            candidates.append(
+                self._rows_by_trader.get(self._trader_ids.get(trader), array("Q"))
+            )
+        if not candidates:
+            return range(low, high)
+
+        candidates.sort(key=len)
+        rows = candidates[0]
+        rows = rows[bisect_left(rows, low) : bisect_left(rows, high)]
+        for other in candidates[1:]:
+            other_rows = set(other[bisect_left(other, low) : bisect_left(other, high)])
+            rows = [row for row in rows if row in other_rows]
+        return rows
+
+    def records(self, **filters):
+        return [self.record(row) for row in self.query(**filters)]
+
+    def export(self, path):
+        names = self._pack_strings(self.trader_names)
+        symbols = self._pack_strings(self.symbols)
+        with open(path, "wb") as log_file:
+            log_file.write(
+                self.FILE_HEADER.pack(self.MAGIC, len(self), len(names), len(symbols))
+            )
+            log_file.write(names)
+            log_file.write(symbols)
+            for column in self._columns():
+                column.tofile(log_file)
+
+    @classmethod
+    def load(cls, path):
+        order_log = cls()
+        with open(path, "rb") as log_file:
+            magic, count, names_length, symbols_length = cls.FILE_HEADER.unpack(
+                log_file.read(cls.FILE_HEADER.size)
+            )
+            if magic != cls.MAGIC:
+                raise ValueError(f"{path} is not an order log")
+            order_log.trader_names = cls._unpack_strings(log_file.read(names_length))
+            order_log.symbols = cls._unpack_strings(log_file.read(symbols_length))
+            for column in order_log._columns():
+                column.fromfile(log_file, count)
+
+        order_log._trader_ids = {
+            name: i for i, name in enumerate(order_log.trader_names)
+        }
+        order_log._symbol_ids = {
+            symbol: i for i, symbol in enumerate(order_log.symbols)
+        }
+        for row, (trader_id, symbol_id) in enumerate(
+            zip(order_log.trader_column, order_log.symbol_column)
+        ):
+            order_log._rows_by_symbol.setdefault(symbol_id, array("Q")).append(row)
+            order_log._rows_by_trader.setdefault(trader_id, array("Q")).append(row)
+        return order_log
+
+    @classmethod
+    def _pack_strings(cls, values):
+        packed = []
+        for value in values:
+            encoded = value.encode("utf-8")
+            packed.append(cls.STRING_LENGTH.pack(len(encoded)) + encoded)
+        return b"".join(packed)
+
+    @classmethod
+    def _unpack_strings(cls, data):
+        values = []
+        offset = 0
+        while offset < len(data):
+            (length,) = cls.STRING_LENGTH.unpack_from(data, offset)
+            offset += cls.STRING_LENGTH.size
+            values.append(data[offset : offset + length].decode("utf-8"))
+            offset += length
+        return values
+
+    def _columns(self):
+        return (
+            self.trader_column,
+            self.side_column,
+            self.symbol_column,
+            self.quantity_column,
+            self.price_column,
+            self.timestamp_column,
+            self.arrival_column,
+        )
+
+
+class MatchingExchange(StockExchangeMediator):
+    def __init__(self):
+        self.books = {}
+        self.order_log = OrderLog()
+        self._order_ids = itertools.count(1)
+
+    def execute_order(self, trader, order):
+        order.trader = trader
+        order.order_id = next(self._order_ids)
+        self.order_log.append_order(trader, order)
+        book = self.books.get(order.symbol)
+        if book is None:
+            book = self.books[order.symbol] = OrderBook(order.symbol)
+
+        fills = book.match(order)
+        for fill in fills:
+            for filled_order in (fill.buy_order, fill.sell_order):
+                if filled_order.trader is not None:
+                    filled_order.trader.on_fill(fill)
+        return fills
+
+
+class OrderRejected(Exception):
+    pass
+
+
+class AsyncStockExchange(StockExchangeMediator):
+    """
+    Accepts orders from many trader coroutines through a bounded ingress queue. A single matching loop drains the
+    queue into a MatchingExchange, so the books have one writer. `execute_order` returns once the order has been
+    matched, with the resulting fills as the acknowledgement. When the queue is full the exchange either waits
+    for room (BLOCK), rejects the new order (REJECT) or drops the oldest queued order (SHED); rejected and shed
+    orders raise OrderRejected to the submitting trader.
+    """
+
+    BLOCK = "block"
+    REJECT = "reject"
+    SHED = "shed"
+
+    def __init__(self, maxsize=1024, policy=BLOCK, exchange=None):
+        if policy not in (self.BLOCK, self.REJECT, self.SHED):
+            raise ValueError(f"Unknown backpressure policy: {policy}")
+        self.exchange = MatchingExchange() if exchange is None else exchange
+        self.policy = policy
+        self.rejected = 0
+        self._queue = asyncio.Queue(maxsize=maxsize)
+        self._matcher = None
+
+    def start(self):
+        if self._matcher is None:
+            self._matcher = asyncio.get_running_loop().create_task(self._match_orders())
+
+    async def execute_order(self, trader, order):
+        self.start()
+        acknowledgement = asyncio.get_running_loop().create_future()
+        item = (trader, order, acknowledgement)
+        if self.policy == self.BLOCK:
+            await self._queue.put(item)
+        else:
+            if self._queue.full():
+                self.rejected += 1
+                if self.policy == self.REJECT:
+                    raise OrderRejected(f"Order queue is full, rejected: {order}")
+                _, shed_order, shed_acknowledgement = self._queue.get_nowait()
+                self._queue.task_done()
+                if not shed_acknowledgement.done():
+                    shed_acknowledgement.set_exception(
+                        OrderRejected(f"Order shed under load: {shed_order}")
+                    )
+            self._queue.put_nowait(item)
+        return await acknowledgement
+
+    async def _match_orders(self):
+        while True:
+            trader, order, acknowledgement = await self._queue.get()
+            try:
+                fills = self.exchange.execute_order(trader, order)
+                if not acknowledgement.done():
+                    acknowledgement.set_result(fills)
+            except Exception as error:
+                if not acknowledgement.done():
+                    acknowledgement.set_exception(error)
+            finally:
+                self._queue.task_done()
+
+    async def close(self):
+        await self._queue.join()
+        if self._matcher is not None:
+            self._matcher.cancel()
+            await asyncio.gather(self._matcher, return_exceptions=True)
+            self._matcher = None
+
+
 class Trader:
     def __init__(self, name, mediator):
         self.name = name
         self.mediator = mediator
+        self.fills = []
+
+    def buy(self, stock_symbol, quantity, price=None):
+        order = Order(BUY, stock_symbol, quantity, price)
+        return self.mediator.execute_order(self, order)
+
+    def sell(self, stock_symbol, quantity, price=None):
+        order = Order(SELL, stock_symbol, quantity, price)
+        return self.mediator.execute_order(self, order)
+
+    def on_fill(self, fill):
+        self.fills.append(fill)
+
 
-    def buy(self, stock_symbol, quantity):
-        order = f"Buy {quantity} shares of {stock_symbol}"
-        self.mediator.execute_order(self, order)
+def benchmark_matching(
+    order_count=1_000_000, symbols=("AAPL", "GOOGL", "MSFT"), seed=0
+):
+    """Feeds a synthetic limit order stream through a MatchingExchange and reports throughput and p99 latency."""
+    rng = random.Random(seed)
+    exchange = MatchingExchange()
+    orders = [
+        Order(
+            rng.choice((BUY, SELL)),
+            rng.choice(symbols),
+            rng.randint(1, 100),
+            round(rng.gauss(100.0, 1.0), 2),
+        )
+        for _ in range(order_count)
+    ]
 
-    def sell(self, stock_symbol, quantity):
-        order = f"Sell {quantity} shares of {stock_symbol}"
-        self.mediator.execute_order(self, order)
+    latencies = []
+    fill_count = 0
+    started = time.perf_counter()
+    for order in orders:
+        order_started = time.perf_counter_ns()
+        fill_count += len(exchange.execute_order(None, order))
+        latencies.append(time.perf_counter_ns() - order_started)
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "orders": order_count,
+        "fills": fill_count,
+        "orders_per_second": order_count / elapsed,
+        "p99_latency_us": latencies[int(0.99 * (len(latencies) - 1))] / 1000,
+    }
 
 
 if __name__ == "__main__":
@@ -61,3 +464,45 @@ if __name__ == "__main__":
     print("\nOrder Log:")
     for order in exchange.orders:
         print(order)
+
+    matching_exchange = MatchingExchange()
+    seller = Trader("Carol", matching_exchange)
+    buyer = Trader("Dave", matching_exchange)
+    seller.sell("AAPL", 100, price=150.0)
+    seller.sell("AAPL", 50, price=151.0)
+    buyer.buy("AAPL", 120, price=151.0)
+    for fill in buyer.fills:
+        print(f"Dave bought {fill.quantity} {fill.symbol} at {fill.price}")
+
+    print(benchmark_matching(order_count=100_000))
+
+    print("\nDave's AAPL orders:")
+    for record in matching_exchange.order_log.records(symbol="AAPL", trader="Dave"):
+        print(record)
+    with tempfile.TemporaryDirectory() as log_dir:
+        log_path = f"{log_dir}/orders.bin"
+        matching_exchange.order_log.export(log_path)
+        print(f"Reloaded {len(OrderLog.load(log_path))} orders from {log_path}")
+
+    async def run_async_exchange():
+        async_exchange = AsyncStockExchange(maxsize=64, policy=AsyncStockExchange.SHED)
+        traders = [Trader(f"Trader {number}", async_exchange) for number in range(1000)]
+
+        async def trade(trader, number):
+            try:
+                if number % 2:
+                    return await trader.buy("AAPL", 10, price=100.0 + number % 5)
+                return await trader.sell("AAPL", 10, price=100.0 + number % 7)
+            except OrderRejected:
+                return None
+
+        results = await asyncio.gather(
+            *(trade(trader, number) for number, trader in enumerate(traders))
+        )
+        await async_exchange.close()
+        accepted = sum(result is not None for result in results)
+        print(
+            f"Async exchange accepted {accepted} orders, shed {async_exchange.rejected}"
+        )
+
+    asyncio.run(run_async_exchange())
@@ -16,39 +16,291 @@ It adheres to the Single Responsibility Principle (SRP), making the codebase mor
 By saving a series of Mementos as the user performs actions, you can easily revert to previous states when the user requests an undo operation.
 This feature enhances the user experience in applications where users expect the ability to reverse their actions.
 """
+import mmap
+import os
+import tempfile
+from array import array
+
+
+class ContentBuffer:
+    """
+    Append-only text buffer kept as a list of chunks, so appending does not copy the document.
+    Snapshots share the chunk list with the live buffer and the text is only joined into a string on demand.
+    """
+
+    def __init__(self, text=""):
+        self._chunks = [text] if text else []
+        self._count = len(self._chunks)
+        self._length = len(text)
+
+    def append(self, text):
+        if self._count != len(self._chunks):
+            # Another buffer sharing the chunk list has appended past our end; stop sharing.
+            self._chunks = self._chunks[: self._count]
+        self._chunks.append(text)
+        self._count += 1
+        self._length += len(text)
+
+    def snapshot(self):
+        snapshot = ContentBuffer()
+        snapshot._chunks = self._chunks
+        snapshot._count = self._count
+        snapshot._length = self._length
+        return snapshot
+
+    def __len__(self):
+        return self._length
+
+    def __str__(self):
+        if self._count == 1:
+            return self._chunks[0]
+        if self._count == 0:
+            return ""
+        text = "".join(self._chunks[: self._count])
+        self._chunks = [text]
+        self._count = 1
+        return text
 
 
 class EditorMemento:
     def __init__(self, content):
-        self.content = content
+        # Either a str or a ContentBuffer snapshot, which is only joined into a string when read.
+        self._content = content
+
+    @property
+    def content(self):
+        return str(self._content)
 
     def get_content(self):
-        return self.content
+        return str(self._content)
+
+
+class DeltaMementoStore:
+    """
+    Stores editor mementos as periodic full snapshots plus the text appended since the previous memento.
+    Rebuilding a memento touches at most `snapshot_interval` entries. With `keep_last`, only the most recent
+    mementos are retained; indices keep counting from the first memento ever saved.
+    """
+
+    def __init__(self, snapshot_interval=32, keep_last=None):
+        if keep_last is not None and keep_last < 1:
+            raise ValueError("keep_last must be at least 1")
+        self.snapshot_interval = snapshot_interval
+        self.keep_last = keep_last
+        self._entries = []
+        self._evicted = 0
+        self._since_snapshot = 0
+        self._last_content = None
+
+    def append(self, memento):
+        content = memento.get_content()
+        previous = self._last_content
+        if (
+            previous is None
+            or self._since_snapshot >= self.snapshot_interval
+            or not content.startswith(previous)
+        ):
+            self._entries.append((True, content))
+            self._since_snapshot = 1
+        else:
+            self._entries.append((False, content[len(previous) :]))
+            self._since_snapshot += 1
+        self._last_content = content
+
+        if self.keep_last is not None and len(self._entries) > self.keep_last:
+            self._evict(len(self._entries) - self.keep_last)
+
+    def _evict(self, count):
+        first_kept = self._content_at(count)
+        del self._entries[:count]
+        self._entries[0] = (True, first_kept)
+        self._evicted += count
+
+    def _content_at(self, position):
+        start = position
+        while not self._entries[start][0]:
+            start -= 1
+        return "".join(text for _, text in self._entries[start : position + 1])
+
+    def __len__(self):
+        return self._evicted + len(self._entries)
+
+    @property
+    def first_index(self):
+        return self._evicted
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        position = index - self._evicted
+        if not 0 <= position < len(self._entries):
+            raise IndexError("Memento is not available")
+        return EditorMemento(self._content_at(position))
+
+
+class FileMementoStore:
+    """
+    Spills editor mementos to an append-only file on local disk. Snapshots are read through `mmap`, so the history
+    does not live on the heap and reading one memento is a single lookup in the offset index. The index is kept in
+    a `.idx` file next to the data file, so reopening a session does not scan the log.
+    """
+
+    # The index starts with the number of mementos dropped by compaction and the data file generation,
+    # followed by an (offset, length) pair per memento.
+    HEADER = 2
+
+    def __init__(self, path):
+        self.path = path
+        self.index_path = path + ".idx"
+        self._offsets = array("Q")
+        self._map = None
+
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "rb") as index_file:
+                raw = index_file.read()
+            # A crash while appending can leave a partial record at the end of the index; drop it.
+            usable = len(raw) // 8
+            if usable % 2:
+                usable -= 1
+            self._offsets.frombytes(raw[: usable * 8])
+            if usable * 8 != len(raw):
+                os.truncate(self.index_path, usable * 8)
+
+        self._index = open(self.index_path, "ab")
+        if not self._offsets:
+            self._offsets.extend((0, 0))
+            self._offsets.tofile(self._index)
+            self._index.flush()
+        self._data = open(self._data_path(self._offsets[1]), "a+b")
+
+    def _data_path(self, generation):
+        # Compaction writes a new generation of the data file, so replacing the index switches both at once.
+        return self.path if not generation else f"{self.path}.{generation}"
+
+    def append(self, memento):
+        data = memento.get_content().encode("utf-8")
+        offset = self._data.seek(0, os.SEEK_END)
+        self._data.write(data)
+        self._data.flush()
+        record = array("Q", (offset, len(data)))
+        record.tofile(self._index)
+        self._index.flush()
+        self._offsets.extend(record)
+
+    def __len__(self):
+        return self._offsets[0] + (len(self._offsets) - self.HEADER) // 2
+
+    @property
+    def first_index(self):
+        return self._offsets[0]
+
+    def get_bytes(self, index):
+        """Returns a memoryview over the stored snapshot without copying it; release it before compacting."""
+        if index < 0:
+            index += len(self)
+        position = index - self._offsets[0]
+        if not 0 <= position < (len(self._offsets) - self.HEADER) // 2:
+            raise IndexError("Memento is not available")
+        record = self.HEADER + 2 * position
+        offset, length = self._offsets[record], self._offsets[record + 1]
+        if not length:
+            return memoryview(b"")
+        if self._map is None or offset + length > len(self._map):
+            self._remap()
+        return memoryview(self._map)[offset : offset + length]
+
+    def __getitem__(self, index):
+        with self.get_bytes(index) as data:
+            return EditorMemento(str(data, "utf-8"))
+
+    def _remap(self):
+        if self._map is not None:
+            self._map.close()
+        self._map = mmap.mmap(self._data.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def compact(self, keep_last):
+        """
+        Rewrites the log keeping only the last `keep_last` mementos. The kept snapshots go to a new data file
+        generation, and the index naming it is swapped in with a single `os.replace`, so a crash leaves either
+        the old or the new history intact.
+        """
+        stored = (len(self._offsets) - self.HEADER) // 2
+        drop = max(0, stored - keep_last)
+        generation = self._offsets[1] + 1
+        data_path = self._data_path(generation)
+        offsets = array("Q", (self._offsets[0] + drop, generation))
+        with open(data_path, "wb") as data_file:
+            for position in range(drop, stored):
+                with self.get_bytes(self._offsets[0] + position) as data:
+                    offsets.extend((data_file.tell(), len(data)))
+                    data_file.write(data)
+            data_file.flush()
+            os.fsync(data_file.fileno())
+        with open(self.index_path + ".tmp", "wb") as index_file:
+            offsets.tofile(index_file)
+            index_file.flush()
+            os.fsync(index_file.fileno())
+
+        old_data_path = self._data.name
+        self.close()
+        os.replace(self.index_path + ".tmp", self.index_path)
+        os.remove(old_data_path)
+        self._data = open(data_path, "a+b")
+        self._index = open(self.index_path, "ab")
+        self._offsets = offsets
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._data.close()
+        self._index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
 
 
 class Editor:
-    def __init__(self):
-        self.content = ""
-        self.mementos = []
-        self.current = 0
+    def __init__(self, mementos=None):
+        self._buffer = ContentBuffer()
+        self.mementos = [] if mementos is None else mementos
+        self.current = len(self.mementos)
+
+    @property
+    def content(self):
+        return str(self._buffer)
+
+    @content.setter
+    def content(self, content):
+        self._buffer = ContentBuffer(content)
 
     def write(self, words):
-        self.content += words
+        self._buffer.append(words)
 
     def save(self):
-        memento = EditorMemento(self.content)
+        memento = EditorMemento(self._buffer.snapshot())
         self.mementos.append(memento)
         self.current += 1
         return memento
 
     def restore(self, index):
         memento = self.mementos[index]
-        self.content = memento.get_content()
+        self._restore_memento(memento)
 
     def undo(self):
-        if self.current > 0:
+        # Stores with bounded retention can no longer restore mementos before their first index.
+        if self.current > getattr(self.mementos, "first_index", 0):
             self.current -= 1
             memento = self.mementos[self.current]
+            self._restore_memento(memento)
+
+    def _restore_memento(self, memento):
+        if isinstance(memento._content, ContentBuffer):
+            self._buffer = memento._content.snapshot()
+        else:
             self.content = memento.get_content()
 
 
@@ -74,3 +326,25 @@ if __name__ == "__main__":
 
     editor.undo()
     print(editor.content)  # Hello world!
+
+    delta_editor = Editor(DeltaMementoStore(snapshot_interval=4, keep_last=10))
+    for sentence_number in range(20):
+        delta_editor.write(f"Sentence {sentence_number}. ")
+        delta_editor.save()
+
+    delta_editor.restore(15)
+    print(delta_editor.content)  # Sentence 0. ... Sentence 15.
+
+    with tempfile.TemporaryDirectory() as history_dir:
+        history_path = os.path.join(history_dir, "history.log")
+        with FileMementoStore(history_path) as history:
+            file_editor = Editor(history)
+            for sentence_number in range(5):
+                file_editor.write(f"Sentence {sentence_number}. ")
+                file_editor.save()
+            history.compact(keep_last=3)
+
+        with FileMementoStore(history_path) as history:
+            reopened_editor = Editor(history)
+            reopened_editor.restore(len(history) - 1)
+            print(reopened_editor.content)  # Sentence 0. ... Sentence 4.
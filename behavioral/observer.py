@@ -15,16 +15,71 @@ The Observer pattern offers several benefits in software design and development,
 
 These benefits make the Observer pattern a powerful and versatile design pattern for building systems that need to propagate changes and events efficiently while maintaining modularity and flexibility.
 """
+import asyncio
+import atexit
+import inspect
+import threading
+import time
+import weakref
 from abc import ABC, abstractmethod
 
 
+class ObserverRegistry:
+    """
+    Holds observers through weak references in insertion order. Attach and detach are O(1), observers that are
+    garbage collected drop out on their own, and iterating works on a snapshot so observers may attach or
+    detach while a notification is in progress.
+    """
+
+    def __init__(self):
+        self._refs = {}
+
+    def add(self, observer):
+        key = id(observer)
+        if key not in self._refs:
+            self._refs[key] = weakref.ref(observer, self._make_cleanup(key))
+
+    def remove(self, observer):
+        ref = self._refs.get(id(observer))
+        if ref is None or ref() is not observer:
+            raise ValueError("Observer is not attached")
+        del self._refs[id(observer)]
+
+    def discard(self, observer):
+        ref = self._refs.get(id(observer))
+        if ref is not None and ref() is observer:
+            del self._refs[id(observer)]
+
+    def _make_cleanup(self, key):
+        refs = self._refs
+
+        def cleanup(ref):
+            if refs.get(key) is ref:
+                del refs[key]
+
+        return cleanup
+
+    def __contains__(self, observer):
+        ref = self._refs.get(id(observer))
+        return ref is not None and ref() is observer
+
+    def __len__(self):
+        return len(self._refs)
+
+    def __iter__(self):
+        for ref in list(self._refs.values()):
+            observer = ref()
+            if observer is not None:
+                yield observer
+
+
 class StockMarket:
     def __init__(self):
-        self._observers = []
+        self._observers = ObserverRegistry()
         self._stock_price = None
 
     def attach(self, observer):
-        self._observers.append(observer)
+        self._observers.add(observer)
 
     def detach(self, observer):
         self._observers.remove(observer)
@@ -38,11 +93,215 @@ class StockMarket:
             observer.update(self._stock_price)
 
 
+class AsyncSubscription:
+    DROP_OLDEST = "drop_oldest"
+    LATEST_ONLY = "latest_only"
+
+    def __init__(self, observer, maxsize=64, policy=DROP_OLDEST):
+        if policy not in (self.DROP_OLDEST, self.LATEST_ONLY):
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        self.observer = observer
+        self.policy = policy
+        self.queue = asyncio.Queue(maxsize=1 if policy == self.LATEST_ONLY else maxsize)
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+        self.lag = 0.0
+        self.task = asyncio.get_running_loop().create_task(self._consume())
+
+    def offer(self, price):
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.queue.task_done()
+            self.dropped += 1
+        self.queue.put_nowait((price, time.monotonic()))
+
+    async def _consume(self):
+        while True:
+            price, published_at = await self.queue.get()
+            try:
+                result = self.observer.update(price)
+                if inspect.isawaitable(result):
+                    await result
+                self.delivered += 1
+            except Exception:
+                # A failing observer must not stop its own subscription.
+                self.errors += 1
+            finally:
+                self.lag = time.monotonic() - published_at
+                self.queue.task_done()
+
+    def metrics(self):
+        return {
+            "queue_depth": self.queue.qsize(),
+            "lag": self.lag,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "errors": self.errors,
+        }
+
+
+class AsyncStockMarket:
+    """
+    Publishes prices without waiting on observers. Every observer gets its own bounded queue and consumer task,
+    so a slow observer only falls behind (and loses stale ticks) instead of stalling the feed.
+    Observers may implement `update` either as a plain method or as a coroutine.
+    Must be used from within a running event loop.
+    """
+
+    def __init__(self, maxsize=64, policy=AsyncSubscription.DROP_OLDEST):
+        self._subscriptions = {}
+        self._stock_price = None
+        self._maxsize = maxsize
+        self._policy = policy
+
+    def attach(self, observer, maxsize=None, policy=None):
+        previous = self._subscriptions.pop(observer, None)
+        if previous is not None:
+            previous.task.cancel()
+        self._subscriptions[observer] = AsyncSubscription(
+            observer, maxsize or self._maxsize, policy or self._policy
+        )
+
+    def detach(self, observer):
+        self._subscriptions.pop(observer).task.cancel()
+
+    def set_stock_price(self, price):
+        self._stock_price = price
+        self.notify()
+
+    def notify(self):
+        for subscription in self._subscriptions.values():
+            subscription.offer(self._stock_price)
+
+    async def join(self):
+        await asyncio.gather(
+            *(
+                subscription.queue.join()
+                for subscription in self._subscriptions.values()
+            )
+        )
+
+    async def close(self):
+        for subscription in self._subscriptions.values():
+            subscription.task.cancel()
+        await asyncio.gather(
+            *(subscription.task for subscription in self._subscriptions.values()),
+            return_exceptions=True,
+        )
+        self._subscriptions.clear()
+
+    def metrics(self):
+        return {
+            observer: subscription.metrics()
+            for observer, subscription in self._subscriptions.items()
+        }
+
+
+# Markets with ticks waiting for a scheduled flush; they are flushed when the interpreter exits.
+_markets_with_pending = weakref.WeakSet()
+
+
+def _flush_pending_markets():
+    for market in list(_markets_with_pending):
+        market.flush()
+
+
+atexit.register(_flush_pending_markets)
+
+
+class TopicStockMarket:
+    """
+    Keeps one price per symbol and a subscription index from symbol to observers, so a tick only reaches
+    the investors subscribed to that symbol.
+
+    With a `coalesce_window` (in seconds), ticks are buffered and only the latest price per symbol is delivered
+    once the window has elapsed. The first tick of a window schedules a flush after `coalesce_window` seconds:
+    on the running event loop when there is one, otherwise on a daemon timer thread. Call `flush()` to deliver
+    pending ticks right away; ticks still pending at interpreter exit are flushed then. Flushes are delivered
+    one at a time, so observers never see an older coalesced price after a newer one.
+    """
+
+    def __init__(self, coalesce_window=0.0, clock=time.monotonic):
+        self._subscriptions = {}
+        self._stock_prices = {}
+        self._pending = {}
+        self._coalesce_window = coalesce_window
+        self._clock = clock
+        self._window_started = None
+        self._flush_handle = None
+        self._lock = threading.Lock()
+        self._delivery_lock = threading.RLock()
+
+    def attach(self, observer, symbols):
+        for symbol in symbols:
+            self._subscriptions.setdefault(symbol, ObserverRegistry()).add(observer)
+
+    def detach(self, observer, symbols=None):
+        for symbol in list(self._subscriptions) if symbols is None else symbols:
+            observers = self._subscriptions.get(symbol)
+            if observers is not None:
+                observers.discard(observer)
+                if not observers:
+                    del self._subscriptions[symbol]
+
+    def get_stock_price(self, symbol):
+        return self._stock_prices.get(symbol)
+
+    def set_stock_price(self, symbol, price):
+        self._stock_prices[symbol] = price
+        if not self._coalesce_window:
+            self.notify(symbol, price)
+            return
+
+        with self._lock:
+            self._pending[symbol] = price
+            if self._window_started is None:
+                self._window_started = self._clock()
+                self._schedule_flush()
+                return
+            due = self._clock() - self._window_started >= self._coalesce_window
+        if due:
+            self.flush()
+
+    def _schedule_flush(self):
+        _markets_with_pending.add(self)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            timer = threading.Timer(self._coalesce_window, self.flush)
+            timer.daemon = True
+            timer.start()
+            self._flush_handle = timer
+        else:
+            self._flush_handle = loop.call_later(self._coalesce_window, self.flush)
+
+    def flush(self):
+        # Taking the pending ticks under the delivery lock keeps concurrent flushes in tick order.
+        with self._delivery_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                self._window_started = None
+                if self._flush_handle is not None:
+                    self._flush_handle.cancel()
+                    self._flush_handle = None
+                _markets_with_pending.discard(self)
+            for symbol, price in pending.items():
+                self.notify(symbol, price)
+
+    def notify(self, symbol, price):
+        for observer in self._subscriptions.get(symbol, ()):
+            observer.update_symbol(symbol, price)
+
+
 class Investor(ABC):
     @abstractmethod
     def update(self, price):
         pass
 
+    def update_symbol(self, symbol, price):
+        self.update(price)
+
 
 class StockInvestor(Investor):
     def __init__(self, name):
@@ -51,6 +310,19 @@ class StockInvestor(Investor):
     def update(self, price):
         print(f"Investor {self._name} received new stock price: {price}")
 
+    def update_symbol(self, symbol, price):
+        print(f"Investor {self._name} received new {symbol} price: {price}")
+
+
+class SlowStockInvestor(Investor):
+    def __init__(self, name, delay):
+        self._name = name
+        self._delay = delay
+
+    async def update(self, price):
+        await asyncio.sleep(self._delay)
+        print(f"Investor {self._name} processed stock price: {price}")
+
 
 if __name__ == "__main__":
     # Step 4: Client code
@@ -65,3 +337,31 @@ if __name__ == "__main__":
     market.set_stock_price(100.0)
     # Update stock price
     market.set_stock_price(120.0)
+
+    async def run_async_market():
+        async_market = AsyncStockMarket(maxsize=2)
+        carol = StockInvestor("Carol")
+        dave = SlowStockInvestor("Dave", delay=0.01)
+        async_market.attach(carol)
+        async_market.attach(dave, policy=AsyncSubscription.LATEST_ONLY)
+
+        for price in (101.0, 102.0, 103.0, 104.0):
+            async_market.set_stock_price(price)
+        await async_market.join()
+
+        for observer, metrics in async_market.metrics().items():
+            print(f"{observer._name}: {metrics}")
+        await async_market.close()
+
+    asyncio.run(run_async_market())
+
+    topic_market = TopicStockMarket(coalesce_window=0.05)
+    topic_market.attach(investor1, ["AAPL"])
+    topic_market.attach(investor2, ["AAPL", "GOOGL"])
+
+    topic_market.set_stock_price("AAPL", 150.0)
+    topic_market.set_stock_price("AAPL", 151.0)
+    topic_market.set_stock_price("GOOGL", 2800.0)
+    time.sleep(
+        0.1
+    )  # The scheduled flush delivers only AAPL at 151.0 and GOOGL at 2800.0
@@ -22,9 +22,19 @@ Overall, the State pattern helps manage the behavior of objects in a flexible an
 different states and exhibit varying behaviors. It encourages good design principles like the Single Responsibility Principle and enhances code maintainability and readability.
 """
 from abc import ABC, abstractmethod
+from array import array
 
 
 class DocumentState(ABC):
+    # One shared instance per state class; documents never allocate states of their own.
+    _instances = {}
+
+    def __new__(cls):
+        instance = DocumentState._instances.get(cls)
+        if instance is None:
+            instance = DocumentState._instances[cls] = super().__new__(cls)
+        return instance
+
     @abstractmethod
     def handle(self):
         pass
@@ -56,6 +66,184 @@ class Document:
         return self.state.handle()
 
 
+class StateMachine:
+    """
+    Declarative state machine compiled into an integer-indexed transition table. States and events are numbered
+    in the order given, and `table[state_id * len(events) + event_id]` holds the target state id and optional
+    guard (a callable taking the document), or None when the event is not allowed in that state.
+    """
+
+    def __init__(self, states, events, transitions):
+        self.states = [
+            state if isinstance(state, DocumentState) else state() for state in states
+        ]
+        self.events = list(events)
+        self.state_ids = {state: state_id for state_id, state in enumerate(self.states)}
+        self.event_ids = {event: event_id for event_id, event in enumerate(self.events)}
+        self.table = [None] * (len(self.states) * len(self.events))
+        for transition in transitions:
+            source, event, target = transition[:3]
+            guard = transition[3] if len(transition) > 3 else None
+            position = self.state_id(source) * len(self.events) + self.event_ids[event]
+            self.table[position] = (self.state_id(target), guard)
+
+    def state_id(self, state):
+        if not isinstance(state, DocumentState):
+            state = state()
+        return self.state_ids[state]
+
+    def fire(self, document, event):
+        """Moves the document along `event`; returns False when no transition applies or its guard refuses."""
+        entry = self.table[
+            self.state_ids[document.state] * len(self.events) + self.event_ids[event]
+        ]
+        if entry is None:
+            return False
+        target_id, guard = entry
+        if guard is not None and not guard(document):
+            return False
+        document.state = self.states[target_id]
+        return True
+
+    def fire_many(self, documents, event):
+        """Fires one event for many documents, resolving the event's column of the table once."""
+        event_id = self.event_ids[event]
+        event_count = len(self.events)
+        column = {
+            state: self.table[state_id * event_count + event_id]
+            for state, state_id in self.state_ids.items()
+        }
+        states = self.states
+        moved = 0
+        for document in documents:
+            entry = column[document.state]
+            if entry is None:
+                continue
+            target_id, guard = entry
+            if guard is not None and not guard(document):
+                continue
+            document.state = states[target_id]
+            moved += 1
+        return moved
+
+
+DOCUMENT_WORKFLOW = StateMachine(
+    states=[DraftState, ModeratedState, PublishedState],
+    events=["submit", "approve", "reject", "retract"],
+    transitions=[
+        (DraftState, "submit", ModeratedState),
+        (ModeratedState, "approve", PublishedState),
+        (ModeratedState, "reject", DraftState),
+        (PublishedState, "retract", DraftState),
+    ],
+)
+
+
+class DocumentStore:
+    """
+    Keeps the workflow state of many documents as one small-int state id per document, plus an index from
+    each state to the ids of the documents in it. Listing the documents in a state costs O(result), and
+    firing an event for every document moves whole index buckets. `view(document_id)` returns a Document
+    backed by one row of the store.
+    """
+
+    def __init__(self, machine=DOCUMENT_WORKFLOW):
+        self.machine = machine
+        self.state_column = array("B")
+        self.index = [set() for _ in machine.states]
+
+    def __len__(self):
+        return len(self.state_column)
+
+    def add(self, state=DraftState, count=1):
+        """Adds `count` documents in `state` and returns the range of their ids."""
+        state_id = self.machine.state_id(state)
+        first = len(self.state_column)
+        self.state_column.extend(array("B", [state_id]) * count)
+        self.index[state_id].update(range(first, first + count))
+        return range(first, first + count)
+
+    def state_of(self, document_id):
+        return self.machine.states[self.state_column[document_id]]
+
+    def set_state(self, document_id, state):
+        old_state_id = self.state_column[document_id]
+        new_state_id = self.machine.state_id(state)
+        self.index[old_state_id].discard(document_id)
+        self.index[new_state_id].add(document_id)
+        self.state_column[document_id] = new_state_id
+
+    def documents_in(self, state):
+        """Returns a snapshot of the ids of the documents currently in `state`."""
+        return frozenset(self.index[self.machine.state_id(state)])
+
+    def view(self, document_id):
+        return DocumentView(self, document_id)
+
+    def fire_many(self, event, document_ids=None):
+        """Fires `event` for the given documents (all documents by default); returns how many moved."""
+        machine = self.machine
+        event_id = machine.event_ids[event]
+        event_count = len(machine.events)
+        entries = [
+            (state_id, machine.table[state_id * event_count + event_id])
+            for state_id in range(len(machine.states))
+        ]
+
+        if document_ids is None:
+            buckets = {
+                state_id: self.index[state_id] for state_id, entry in entries if entry
+            }
+        else:
+            buckets = {}
+            for document_id in document_ids:
+                buckets.setdefault(self.state_column[document_id], set()).add(
+                    document_id
+                )
+
+        # Collect every move first so documents only take one step per event.
+        moves = []
+        for state_id, entry in entries:
+            candidates = buckets.get(state_id)
+            if not entry or not candidates:
+                continue
+            target_id, guard = entry
+            if guard is not None:
+                candidates = {
+                    document_id
+                    for document_id in candidates
+                    if guard(self.view(document_id))
+                }
+            moves.append((state_id, target_id, candidates))
+
+        moved = 0
+        for state_id, target_id, candidates in moves:
+            if candidates is self.index[state_id]:
+                self.index[state_id] = set()
+            else:
+                self.index[state_id] -= candidates
+            for document_id in candidates:
+                self.state_column[document_id] = target_id
+            moved += len(candidates)
+        for state_id, target_id, candidates in moves:
+            self.index[target_id] |= candidates
+        return moved
+
+
+class DocumentView(Document):
+    def __init__(self, store, document_id):
+        self.store = store
+        self.document_id = document_id
+
+    @property
+    def state(self):
+        return self.store.state_of(self.document_id)
+
+    @state.setter
+    def state(self, state):
+        self.store.set_state(self.document_id, state)
+
+
 if __name__ == "__main__":
     document = Document()
 
@@ -70,3 +258,17 @@ if __name__ == "__main__":
     published_state = PublishedState()
     document.set_state(published_state)
     print(document.perform_action())  # Output: Document has been published
+
+    documents = [Document() for _ in range(5)]
+    for workflow_document in documents:
+        workflow_document.set_state(DraftState())
+    print(DOCUMENT_WORKFLOW.fire_many(documents, "submit"))  # Output: 5
+    print(DOCUMENT_WORKFLOW.fire(documents[0], "approve"))  # Output: True
+    print(documents[0].perform_action())  # Output: Document has been published
+
+    store = DocumentStore()
+    store.add(DraftState, count=1000)
+    print(store.fire_many("submit"))  # Output: 1000
+    print(store.fire_many("approve", document_ids=range(10)))  # Output: 10
+    print(len(store.documents_in(ModeratedState)))  # Output: 990
+    print(store.view(0).perform_action())  # Output: Document has been published
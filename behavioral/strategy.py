@@ -28,6 +28,8 @@ In summary, the Strategy design pattern offers a powerful way to manage algorith
 """
 
 from abc import ABC, abstractmethod
+from array import array
+from operator import mul
 
 
 class InvestInterface:
@@ -35,6 +37,12 @@ class InvestInterface:
     def invest(self):
         pass
 
+    def allocate(self, wealth=None):
+        """Returns the amount to invest in each asset, for `wealth` or the strategy's own wealth."""
+        if wealth is None:
+            wealth = self.wealth
+        return {asset: wealth * percent / 100 for asset, percent in self.assets.items()}
+
 
 class LessRiskInvesting(InvestInterface):
     def __init__(self, wealth):
@@ -69,14 +77,99 @@ class HighRiskInvesting(InvestInterface):
         )
 
 
+class StrategyRegistry:
+    """
+    Strategies registered by name, so an app can be switched to another strategy at runtime. Allocations are
+    not memoized: computing one is a single pass over a handful of asset weights, which is cheaper than building
+    and looking up a cache key for it.
+    """
+
+    def __init__(self):
+        self._strategies = {}
+
+    def register(self, name, strategy_type):
+        self._strategies[name] = strategy_type
+
+    def names(self):
+        return list(self._strategies)
+
+    def create(self, name, wealth):
+        return self._strategies[name](wealth)
+
+    def swap(self, app, name):
+        app.set_strategy(self.create(name, app.investing_strategy.wealth))
+
+
 class InvestingApp:
     def __init__(self, investing_strategy):
         self.investing_strategy = investing_strategy
 
+    def set_strategy(self, investing_strategy):
+        self.investing_strategy = investing_strategy
+
     def invest(self):
         self.investing_strategy.invest()
 
+    def allocate(self):
+        return self.investing_strategy.allocate()
+
+
+class AllocationEngine:
+    """
+    Computes allocations for many clients at once. The strategies' asset percentages form a weight matrix
+    (one row per strategy, one column per asset), and each asset column of the result is the client wealth
+    vector multiplied by that asset's weights, selected by each client's strategy id.
+    """
+
+    def __init__(self, strategies):
+        self.strategies = [
+            strategy if isinstance(strategy, InvestInterface) else strategy(0)
+            for strategy in strategies
+        ]
+        self.assets = []
+        for strategy in self.strategies:
+            for asset in strategy.assets:
+                if asset not in self.assets:
+                    self.assets.append(asset)
+        self.weights = {
+            asset: array(
+                "d",
+                (strategy.assets.get(asset, 0) / 100 for strategy in self.strategies),
+            )
+            for asset in self.assets
+        }
+
+    def allocate(self, wealth, strategy_ids):
+        """
+        Takes parallel sequences of client wealth and strategy ids (indexes into `strategies`) and returns
+        a dict mapping each asset to an array of per-client amounts.
+        """
+        return {
+            asset: array("d", map(mul, wealth, map(weights.__getitem__, strategy_ids)))
+            for asset, weights in self.weights.items()
+        }
+
 
 if __name__ == "__main__":
     app_instance = InvestingApp(LessRiskInvesting(100000))
     app_instance.invest()
+    print(app_instance.allocate())
+
+    engine = AllocationEngine(
+        [LessRiskInvesting, MediumRiskInvesting, HighRiskInvesting]
+    )
+    allocations = engine.allocate([100000, 250000, 50000], [0, 2, 1])
+    for asset, amounts in allocations.items():
+        print(asset, list(amounts))
+
+    registry = StrategyRegistry()
+    registry.register("less risk", LessRiskInvesting)
+    registry.register("medium risk", MediumRiskInvesting)
+    registry.register("high risk", HighRiskInvesting)
+
+    client_app = InvestingApp(registry.create("less risk", 100200))
+    print(client_app.allocate())
+    registry.swap(client_app, "high risk")
+    client_app.invest()
+    print(client_app.allocate())
+    print(registry.names())
@@ -16,7 +16,10 @@ The Visitor pattern offers several benefits in software design and architecture,
 These benefits make the Visitor pattern particularly valuable when dealing with complex object structures where various operations need to be applied to different object types without modifying those types directly. It promotes maintainable, extensible, and well-organized code.
 """
 
+import os
 from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from operator import attrgetter, mul
 
 
 class AssetVisitor(ABC):
@@ -28,8 +31,41 @@ class AssetVisitor(ABC):
     def visit_bond(self, bond):
         pass
 
+    def visit_all(self, assets):
+        """
+        Visits a batch of assets without an accept() call per asset. Assets are grouped by their concrete type,
+        and the visitor method for each type is looked up once. A visitor can provide a method named after the
+        asset's `batch_visit_method` (e.g. `visit_stocks`) to process a whole group in one call.
+        """
+        groups = {}
+        for asset in assets:
+            group = groups.get(type(asset))
+            if group is None:
+                group = groups[type(asset)] = []
+            group.append(asset)
+
+        for asset_type, group in groups.items():
+            batch_visit = getattr(self, asset_type.batch_visit_method, None)
+            if batch_visit is not None:
+                batch_visit(group)
+            else:
+                visit = getattr(self, asset_type.visit_method)
+                for asset in group:
+                    visit(asset)
+
+
+class MergeableVisitor(AssetVisitor):
+    """A visitor whose results can be combined, so it can be used for sharded traversals."""
+
+    @abstractmethod
+    def merge(self, other):
+        """Folds the state of another visitor of the same kind into this one (used to combine shard results)."""
+
 
 class Stock:
+    visit_method = "visit_stock"
+    batch_visit_method = "visit_stocks"
+
     def __init__(self, symbol, shares, price_per_share):
         self.symbol = symbol
         self.shares = shares
@@ -40,6 +76,9 @@ class Stock:
 
 
 class Bond:
+    visit_method = "visit_bond"
+    batch_visit_method = "visit_bonds"
+
     def __init__(self, name, face_value, market_price):
         self.name = name
         self.face_value = face_value
@@ -49,7 +88,7 @@ class Bond:
         visitor.visit_bond(self)
 
 
-class PortfolioValueVisitor(AssetVisitor):
+class PortfolioValueVisitor(MergeableVisitor):
     def __init__(self):
         self.total_value = 0
 
@@ -59,6 +98,119 @@ class PortfolioValueVisitor(AssetVisitor):
     def visit_bond(self, bond):
         self.total_value += bond.market_price
 
+    def visit_stocks(self, stocks):
+        self.total_value += sum(
+            map(
+                mul,
+                map(attrgetter("shares"), stocks),
+                map(attrgetter("price_per_share"), stocks),
+            )
+        )
+
+    def visit_bonds(self, bonds):
+        self.total_value += sum(map(attrgetter("market_price"), bonds))
+
+    def merge(self, other):
+        self.total_value += other.total_value
+
+
+class AssetCountVisitor(MergeableVisitor):
+    def __init__(self):
+        self.stocks = 0
+        self.bonds = 0
+
+    def visit_stock(self, stock):
+        self.stocks += 1
+
+    def visit_bond(self, bond):
+        self.bonds += 1
+
+    def visit_stocks(self, stocks):
+        self.stocks += len(stocks)
+
+    def visit_bonds(self, bonds):
+        self.bonds += len(bonds)
+
+    def merge(self, other):
+        self.stocks += other.stocks
+        self.bonds += other.bonds
+
+
+class CompositeVisitor(MergeableVisitor):
+    """Runs several visitors over the assets in a single traversal."""
+
+    def __init__(self, *visitors):
+        self.visitors = visitors
+
+    def visit_stock(self, stock):
+        for visitor in self.visitors:
+            visitor.visit_stock(stock)
+
+    def visit_bond(self, bond):
+        for visitor in self.visitors:
+            visitor.visit_bond(bond)
+
+    def visit_all(self, assets):
+        """Walks `assets` once and hands each asset to every child visitor, in the order they were given."""
+        dispatch = {}
+        for asset in assets:
+            visits = dispatch.get(type(asset))
+            if visits is None:
+                visits = dispatch[type(asset)] = [
+                    getattr(visitor, type(asset).visit_method)
+                    for visitor in self.visitors
+                ]
+            for visit in visits:
+                visit(asset)
+
+    def merge(self, other):
+        for visitor, other_visitor in zip(self.visitors, other.visitors):
+            visitor.merge(other_visitor)
+
+
+def _is_mergeable(visitor):
+    if isinstance(visitor, CompositeVisitor):
+        return all(map(_is_mergeable, visitor.visitors))
+    return isinstance(visitor, MergeableVisitor)
+
+
+def _visit_shard(visitor_factory, shard):
+    visitor = visitor_factory()
+    visitor.visit_all(shard)
+    return visitor
+
+
+def traverse(visitor_factory, assets, executor=None, shards=None):
+    """
+    Visits `assets` with a visitor created by `visitor_factory`. When a ProcessPoolExecutor is given, the assets
+    are split into shards, each shard is visited by its own visitor in a worker process and the results are
+    merged. The factory must then build new MergeableVisitor instances on every call, and both the factory and
+    the assets must be picklable.
+    """
+    if executor is None:
+        return _visit_shard(visitor_factory, assets)
+
+    result = visitor_factory()
+    if not _is_mergeable(result):
+        raise TypeError(
+            f"{type(result).__name__} cannot be merged, so it cannot be sharded"
+        )
+    shards = shards or os.cpu_count() or 1
+    shard_size = max(1, -(-len(assets) // shards))
+    futures = [
+        executor.submit(
+            _visit_shard, visitor_factory, assets[start : start + shard_size]
+        )
+        for start in range(0, len(assets), shard_size)
+    ]
+    for future in futures:
+        result.merge(future.result())
+    return result
+
+
+def value_and_count_visitor():
+    return CompositeVisitor(PortfolioValueVisitor(), AssetCountVisitor())
+
 
 if __name__ == "__main__":
     stock1 = Stock("AAPL", 100, 150.0)
@@ -72,3 +224,16 @@ if __name__ == "__main__":
 
     total_portfolio_value = portfolio_visitor.total_value
     print(f"Total portfolio value: ${total_portfolio_value:.2f}")
+
+    batch_visitor = PortfolioValueVisitor()
+    batch_visitor.visit_all([stock1, stock2, bond1])
+    print(f"Total portfolio value (batch): ${batch_visitor.total_value:.2f}")
+
+    assets = [stock1, stock2, bond1] * 1000
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        composite_visitor = traverse(value_and_count_visitor, assets, executor)
+    value_visitor, count_visitor = composite_visitor.visitors
+    print(
+        f"Sharded traversal: ${value_visitor.total_value:.2f} across "
+        f"{count_visitor.stocks} stocks and {count_visitor.bonds} bonds"
+    )
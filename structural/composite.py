@@ -23,48 +23,241 @@ These benefits make the Composite pattern a powerful tool for designing and mana
 organizational hierarchies, file systems, and financial portfolios. It simplifies code, enhances flexibility, and allows you to work with hierarchical data 
 structures in a more intuitive and consistent way.
 """
+import operator
 from abc import ABC, abstractmethod
+from array import array
 
 
 class Investment(ABC):
+    parent = None
+
     @abstractmethod
     def get_value(self):
         pass
 
+    def _notify_parent(self, delta):
+        if self.parent is not None:
+            self.parent._propagate(delta)
+
 
 class Stock(Investment):
     def __init__(self, symbol, quantity, price_per_share):
         self.symbol = symbol
-        self.quantity = quantity
-        self.price_per_share = price_per_share
+        self._quantity = quantity
+        self._price_per_share = price_per_share
+
+    @property
+    def quantity(self):
+        return self._quantity
+
+    @quantity.setter
+    def quantity(self, quantity):
+        old_value = self.get_value()
+        self._quantity = quantity
+        self._notify_parent(self.get_value() - old_value)
+
+    @property
+    def price_per_share(self):
+        return self._price_per_share
+
+    @price_per_share.setter
+    def price_per_share(self, price_per_share):
+        old_value = self.get_value()
+        self._price_per_share = price_per_share
+        self._notify_parent(self.get_value() - old_value)
 
     def get_value(self):
-        return self.quantity * self.price_per_share
+        return self._quantity * self._price_per_share
 
 
 class Bond(Investment):
     def __init__(self, name, face_value, market_value):
         self.name = name
         self.face_value = face_value
-        self.market_value = market_value
+        self._market_value = market_value
+
+    @property
+    def market_value(self):
+        return self._market_value
+
+    @market_value.setter
+    def market_value(self, market_value):
+        delta = market_value - self._market_value
+        self._market_value = market_value
+        self._notify_parent(delta)
 
     def get_value(self):
-        return self.market_value
+        return self._market_value
 
 
 class Portfolio(Investment):
+    """
+    A portfolio caches the value of its subtree. Single leaf updates push their delta up the parent links,
+    so a price tick costs O(depth). Batched updates only mark the affected paths dirty, and each dirty
+    portfolio is recomputed once, the next time its value is requested.
+
+    Each investment belongs to at most one portfolio, since its value changes are pushed to a single parent.
+    Add holdings through `add_investment`; appending to `investments` directly bypasses the cached value
+    and the holdings index.
+    """
+
     def __init__(self, name):
         self.name = name
         self.investments = []
+        self._value = 0
+        self._dirty = False
+        self._stocks = {}
 
     def add_investment(self, investment):
+        if investment.parent is not None:
+            raise ValueError(
+                f"Investment already belongs to portfolio {investment.parent.name!r}"
+            )
+        investment.parent = self
         self.investments.append(investment)
+        self._propagate(investment.get_value())
+
+        if isinstance(investment, Portfolio):
+            holdings = investment._stocks
+        elif isinstance(investment, Stock):
+            holdings = {investment.symbol: [investment]}
+        else:
+            holdings = {}
+        node = self
+        while node is not None:
+            for symbol, stocks in holdings.items():
+                node._stocks.setdefault(symbol, []).extend(stocks)
+            node = node.parent
+
+    def get_value(self):
+        if self._dirty:
+            total_value = 0
+            for investment in self.investments:
+                total_value += investment.get_value()
+            self._value = total_value
+            self._dirty = False
+        return self._value
+
+    def apply_price_updates(self, prices):
+        for symbol, price in prices.items():
+            for stock in self._stocks.get(symbol, ()):
+                stock._price_per_share = price
+                stock.parent._invalidate()
+        return self.get_value()
+
+    def _propagate(self, delta):
+        # A dirty portfolio (and therefore every ancestor) is recomputed on the next read anyway.
+        node = self
+        while node is not None and not node._dirty:
+            node._value += delta
+            node = node.parent
+
+    def _invalidate(self):
+        node = self
+        while node is not None and not node._dirty:
+            node._dirty = True
+            node = node.parent
+
+
+class ColumnarPortfolio(Investment):
+    """
+    Stores holdings as parallel arrays instead of one object per position, so valuation and revaluation
+    are reductions over columns rather than a get_value() call per Stock or Bond.
+    Bonds are stored with a quantity of 1 and their market value as the price.
+    """
+
+    STOCK = 0
+    BOND = 1
+
+    def __init__(self, name):
+        self.name = name
+        self.symbols = []
+        self._symbol_index = {}
+        self.kinds = array("b")
+        self.symbol_ids = array("q")
+        self.quantities = array("d")
+        self.prices = array("d")
+        self.face_values = array("d")
+        self.market_values = array("d")
+
+    @classmethod
+    def from_investments(cls, name, investments):
+        portfolio = cls(name)
+        portfolio.add_investments(investments)
+        return portfolio
+
+    def symbol_id(self, symbol):
+        if symbol not in self._symbol_index:
+            self._symbol_index[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+        return self._symbol_index[symbol]
+
+    def add_investment(self, investment):
+        self.add_investments([investment])
+
+    def add_investments(self, investments):
+        first_row = len(self.market_values)
+        for investment in investments:
+            if isinstance(investment, Stock):
+                self.kinds.append(self.STOCK)
+                self.symbol_ids.append(self.symbol_id(investment.symbol))
+                self.quantities.append(investment.quantity)
+                self.prices.append(investment.price_per_share)
+                self.face_values.append(0.0)
+            elif isinstance(investment, Bond):
+                self.kinds.append(self.BOND)
+                self.symbol_ids.append(self.symbol_id(investment.name))
+                self.quantities.append(1.0)
+                self.prices.append(investment.market_value)
+                self.face_values.append(investment.face_value)
+            else:
+                raise TypeError(
+                    f"Cannot store {type(investment).__name__} in a columnar portfolio"
+                )
+            self.market_values.append(self.quantities[-1] * self.prices[-1])
+        # Only the appended rows change the value, so adding one holding at a time stays O(1) per holding.
+        self._notify_parent(sum(self.market_values[first_row:]))
+
+    def to_investments(self):
+        investments = []
+        for kind, symbol_id, quantity, price, face_value in zip(
+            self.kinds, self.symbol_ids, self.quantities, self.prices, self.face_values
+        ):
+            symbol = self.symbols[symbol_id]
+            if kind == self.STOCK:
+                investments.append(Stock(symbol, quantity, price))
+            else:
+                investments.append(Bond(symbol, face_value, price))
+        return investments
 
     def get_value(self):
-        total_value = 0
-        for investment in self.investments:
-            total_value += investment.get_value()
-        return total_value
+        return sum(self.market_values)
+
+    def price_vector(self, prices):
+        """Builds a price vector indexed by symbol id, keeping current prices for symbols not in `prices`."""
+        vector = array("d", [0.0]) * len(self.symbols)
+        for symbol_id, price in zip(self.symbol_ids, self.prices):
+            vector[symbol_id] = price
+        for symbol, price in prices.items():
+            if symbol in self._symbol_index:
+                vector[self._symbol_index[symbol]] = price
+        return vector
+
+    def revalue(self, price_vector):
+        old_value = self.get_value()
+        self.prices = array("d", map(price_vector.__getitem__, self.symbol_ids))
+        self.market_values = array("d", map(operator.mul, self.quantities, self.prices))
+        new_value = self.get_value()
+        self._notify_parent(new_value - old_value)
+        return new_value
+
+    def sector_subtotals(self, sectors):
+        symbol_sectors = [sectors.get(symbol, "Other") for symbol in self.symbols]
+        subtotals = {}
+        for symbol_id, market_value in zip(self.symbol_ids, self.market_values):
+            sector = symbol_sectors[symbol_id]
+            subtotals[sector] = subtotals.get(sector, 0) + market_value
+        return subtotals
 
 
 if __name__ == "__main__":
@@ -86,3 +279,27 @@ if __name__ == "__main__":
         print(investment.name)
 
     print(f"Total value: ${total_value}")
+
+    apple_stock.price_per_share = 155.0
+    print(f"Total value after AAPL tick: ${global_portfolio.get_value()}")
+
+    total_value = global_portfolio.apply_price_updates({"AAPL": 160.0, "MSFT": 210.0})
+    print(f"Total value after batch update: ${total_value}")
+
+    columnar_portfolio = ColumnarPortfolio.from_investments(
+        "Columnar Portfolio", [apple_stock, microsoft_stock, government_bond]
+    )
+    print(f"Columnar value: ${columnar_portfolio.get_value()}")
+    print(
+        columnar_portfolio.sector_subtotals(
+            {
+                "AAPL": "Technology",
+                "MSFT": "Technology",
+                "US Treasury Bond": "Government",
+            }
+        )
+    )
+    new_prices = columnar_portfolio.price_vector({"AAPL": 170.0})
+    print(
+        f"Columnar value after revaluation: ${columnar_portfolio.revalue(new_prices)}"
+    )